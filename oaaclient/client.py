@@ -93,7 +93,8 @@ class OAAClient():
     Attributes:
         url (str): URL of the Veza instance to connect to
         api_key (str): Veza API key
-        enable_compression (bool): Enable or disable compression of the OAA payload during push, defaults to enabled (True)
+        enable_compression (bool): Enable or disable compression of the OAA payload during push, defaults to enabled (True).
+            Payloads smaller than `COMPRESSION_MIN_SIZE` bytes are always pushed uncompressed
 
     Raises:
         OAAClientError: For errors connecting to API and if API returns errors
@@ -116,6 +117,11 @@ class OAAClient():
     # default number of seconds for API requests before timeout
     DEFAULT_API_TIMEOUT = 300
 
+    # gzip compression level for OAA payloads when compression is enabled, trades a little size for faster compression
+    COMPRESSION_LEVEL = 6
+    # OAA payloads smaller than this many bytes of JSON are pushed uncompressed even when compression is enabled
+    COMPRESSION_MIN_SIZE = 1024
+
     def __init__(self, url:str = None, api_key: str = None, username: str = None, token: str = None):
 
         if not url and "VEZA_URL" in os.environ:
@@ -438,11 +444,14 @@ class OAAClient():
             with open(out_name, "w") as f:
                 f.write(json.dumps(metadata, indent=2))
 
-        if self.enable_compression:
+        # compact separators, whitespace only adds to the size of the payload sent
+        metadata_json = json.dumps(metadata, separators=(",", ":"))
+        if self.enable_compression and len(metadata_json) >= self.COMPRESSION_MIN_SIZE:
             log.debug("Compressing payload")
-            metadata_bytes = json.dumps(metadata).encode()
+            metadata_bytes = metadata_json.encode()
+            del metadata_json
             metadata_size = sys.getsizeof(metadata_bytes)
-            compressed_bytes = gzip.compress(metadata_bytes)
+            compressed_bytes = gzip.compress(metadata_bytes, compresslevel=self.COMPRESSION_LEVEL)
             del metadata_bytes
 
             encoded = base64.b64encode(compressed_bytes).decode()
@@ -451,7 +460,7 @@ class OAAClient():
             log.debug(f"Compression complete, payload size in bytes: {metadata_size:,}, encoded compressed: {encoded_size:,}")
             payload = {"id": provider["id"], "data_source_id": data_source["id"], "json_data": encoded, "compression_type": "GZIP"}
         else:
-            payload = {"id": provider["id"], "data_source_id": data_source["id"], "json_data": json.dumps(metadata)}
+            payload = {"id": provider["id"], "data_source_id": data_source["id"], "json_data": metadata_json}
 
         if options and isinstance(options, dict):
             log.debug(f"Provider create called with additional options: {options}")
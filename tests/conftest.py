@@ -1,17 +1,51 @@
+import itertools
 import logging
 import os
 import uuid
+from unittest.mock import create_autospec
 
 import pytest
+import requests
 
 from oaaclient.client import OAAClient, OAAClientError
+from oaaclient.utils import encode_icon_file
 
-logging.basicConfig(format='%(asctime)s %(levelname)s - %(name)s - %(message)s', level=logging.DEBUG)
+from generate_app import generate_app
+from generate_hris import generate_hris
+from generate_idp import generate_idp
+from mock_client import MockOAAClient
+
+# debug logging is not enabled by default, run pytest with `--log-level=DEBUG` to include debug logs in test output
 logging.getLogger("urllib3").setLevel(logging.INFO)
 log = logging.getLogger()
 
-@pytest.fixture(scope="module")
+
+def pytest_addoption(parser):
+    parser.addoption("--live", action="store_true", default=bool(os.getenv("PYTEST_VEZA_HOST")),
+                     help="run the tests marked live against a Veza instance, default when PYTEST_VEZA_HOST is set")
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("--live"):
+        return
+
+    skip_live = pytest.mark.skip(reason="Test host is not configured")
+    for item in items:
+        if "live" in item.keywords:
+            item.add_marker(skip_live)
+
+
+@pytest.fixture(scope="session")
 def veza_con():
+    """OAAClient for live tests
+
+    Connects to the Veza instance set by `PYTEST_VEZA_HOST` once per test session, the client's `requests.Session`
+    keeps connections to the host open between tests. Tests that change attributes on the client must use
+    `monkeypatch` so the change is undone.
+
+    Returns:
+        OAAClient: client connection
+    """
     test_deployment = os.getenv("PYTEST_VEZA_HOST")
     test_api_key = os.getenv("VEZA_API_KEY")
     assert test_api_key is not None
@@ -23,10 +57,133 @@ def veza_con():
     del veza_con
 
 @pytest.fixture(scope="module")
-def app_provider(veza_con):
+def mock_veza_con():
+    """OAAClient for unit tests
+
+    Returns a `MockOAAClient` that skips the connection test so that no Veza instance is needed. Tests must mock the
+    HTTP calls made by the client. The client is shared by all the tests in a module, tests that change attributes on
+    it must use `monkeypatch` so the change is undone.
+
+    Returns:
+        OAAClient: client connection
+    """
+    return MockOAAClient(url="https://noreply.vezacloud.com", token="1234")
+
+@pytest.fixture
+def mock_session_request(monkeypatch):
+    """Mocked HTTP requests
+
+    Replaces `requests.Session.request` for the duration of the test so that no HTTP requests are made. Tests set the
+    `return_value` or `side_effect` of the mock to the responses for the client to receive.
+
+    Returns:
+        function: autospec mock of `requests.Session.request`
+    """
+    mock_request = create_autospec(requests.Session.request)
+    monkeypatch.setattr(requests.Session, "request", mock_request)
+
+    return mock_request
+
+@pytest.fixture(scope="session")
+def sample_app():
+    """Sample Custom Application
+
+    Builds the `generate_app` sample application once per test session. Tests must treat the application as read-only,
+    use `copy.deepcopy` on the object before making any changes.
+
+    Returns:
+        CustomApplication: sample application
+    """
+    return generate_app()
+
+@pytest.fixture(scope="session")
+def app_payload(sample_app):
+    """OAA payload for the sample application
+
+    Tests must treat the payload as read-only, use `copy.deepcopy` on the payload before making any changes.
+
+    Returns:
+        dict: sample application payload
+    """
+    return sample_app.get_payload()
+
+@pytest.fixture(scope="session")
+def sample_idp():
+    """Sample Custom IdP
+
+    Builds the `generate_idp` sample IdP once per test session. Tests must treat the IdP as read-only.
+
+    Returns:
+        CustomIdPProvider: sample IdP
+    """
+    return generate_idp()
+
+@pytest.fixture(scope="session")
+def sample_hris():
+    """Sample HRIS
+
+    Builds the `generate_hris` sample HRIS once per test session. Tests must treat the HRIS as read-only, use the
+    `fresh_hris` fixture for an HRIS that can be changed.
+
+    Returns:
+        HRISProvider: sample HRIS
+    """
+    return generate_hris()
+
+@pytest.fixture
+def fresh_hris():
+    """Sample HRIS that can be changed by the test
+
+    Returns:
+        HRISProvider: sample HRIS built for the test
+    """
+    return generate_hris()
+
+# names for things created in Veza only need to be unique within the test session, random nonce per session with a
+# counter per name
+_SESSION_NONCE = uuid.uuid4().hex[:8]
+_NAME_COUNTER = itertools.count()
+
+def _unique_name(prefix: str) -> str:
+    """Returns a name starting with `prefix` that is unique for the test session
+
+    Includes the pytest-xdist worker ID so objects created by parallel workers can be told apart
+    """
+    worker_id = os.getenv("PYTEST_XDIST_WORKER", "master")
+    return f"{prefix}-{worker_id}-{_SESSION_NONCE}-{next(_NAME_COUNTER)}"
+
+@pytest.fixture(scope="session")
+def unique_name():
+    """Name generator for objects created in Veza
+
+    Returns:
+        function: returns a name starting with the given prefix that is unique for the test session
+    """
+    return _unique_name
+
+@pytest.fixture
+def data_source_name(request):
+    """Data source name for the test
+
+    Returns:
+        str: test node ID with the characters that are not allowed in data source names replaced
+    """
+    return request.node.nodeid.replace("/", "-").replace("[", "(").replace("]", ")")
+
+@pytest.fixture(scope="session")
+def b64_icon():
+    """Base64 encoded OAA icon for test Providers
+
+    Returns:
+        str: base64 encoded icon
+    """
+    return encode_icon_file(os.path.join(os.path.dirname(__file__), "oaa_icon.png"))
+
+@pytest.fixture(scope="session")
+def app_provider(veza_con, b64_icon):
     """Custom Application Provider
 
-    Yields a custom application provider that can be used for any test that push to an application,
+    Yields a custom application provider with the OAA icon that can be used for any test that push to an application,
     deletes the provider after yield
 
     Args:
@@ -35,18 +192,17 @@ def app_provider(veza_con):
     Yields:
         _type_: _description_
     """
-    provider_name = f"Pytest Custom Apps {uuid.uuid4()}"
-    provider = veza_con.create_provider(provider_name, "application")
+    provider_name = _unique_name("Pytest Custom Apps")
+    provider = veza_con.create_provider(provider_name, "application", base64_icon=b64_icon)
     yield provider
 
     veza_con.delete_provider(provider["id"])
 
-@pytest.fixture(scope="module")
+@pytest.fixture(scope="session")
 def idp_provider(veza_con):
-    """Custom Application Provider
+    """Custom IdP Provider
 
-    Yields a custom application provider that can be used for any test that push to an application,
-    deletes the provider after yield
+    Yields a custom IdP provider that can be used for any test that push to an IdP, deletes the provider after yield
 
     Args:
         veza_con (_type_): _description_
@@ -54,18 +210,17 @@ def idp_provider(veza_con):
     Yields:
         _type_: _description_
     """
-    provider_name = f"Pytest IdP {uuid.uuid4()}"
+    provider_name = _unique_name("Pytest IdP")
     provider = veza_con.create_provider(provider_name, "identity_provider")
     yield provider
 
     veza_con.delete_provider(provider["id"])
 
-@pytest.fixture(scope="module")
+@pytest.fixture(scope="session")
 def hris_provider(veza_con):
-    """Custom Application Provider
+    """Custom HRIS Provider
 
-    Yields a custom application provider that can be used for any test that push to an application,
-    deletes the provider after yield
+    Yields a custom HRIS provider that can be used for any test that push to an HRIS, deletes the provider after yield
 
     Args:
         veza_con (_type_): _description_
@@ -73,7 +228,7 @@ def hris_provider(veza_con):
     Yields:
         _type_: _description_
     """
-    provider_name = f"Pytest HRIS {uuid.uuid4()}"
+    provider_name = _unique_name("Pytest HRIS")
     provider = veza_con.create_provider(provider_name, "hris")
     yield provider
 
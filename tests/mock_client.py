@@ -0,0 +1,16 @@
+"""
+Copyright 2023 Veza Technologies Inc.
+
+Use of this source code is governed by the MIT
+license that can be found in the LICENSE file or at
+https://opensource.org/licenses/MIT.
+"""
+
+from oaaclient.client import OAAClient
+
+
+class MockOAAClient(OAAClient):
+    """OAAClient that skips the connection test so that no Veza instance is needed"""
+
+    def _test_connection(self) -> None:
+        return None
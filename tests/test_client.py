@@ -7,38 +7,176 @@ https://opensource.org/licenses/MIT.
 """
 
 import base64
+import gzip
+import json
 import logging
 import os
-import time
+import socket
 import uuid
 import urllib3
-import io
-from http.client import HTTPMessage, HTTPResponse
-from unittest.mock import MagicMock, PropertyMock, patch
+from urllib.parse import urlencode
+from unittest.mock import patch
 
 import pytest
 import requests
 from oaaclient.client import OAAClient, OAAClientError, OAAConnectionError, OAAResponseError
-from requests.models import Response
 
-from generate_app import generate_app
 from generate_idp import generate_idp
+from mock_client import MockOAAClient
+
+log = logging.getLogger(__name__)
+
+# API response bodies for mocked responses
+_NOT_JSON = b"This is not json"
+_ERR_INTERNAL = (b'{"code":"Internal",'
+                 b'"message":"Internal Server Error, please retry and if the error persists contact support at support@veza.com",'
+                 b'"request_id":"2271c08a9abd3b425c88a397b01bb351",'
+                 b'"timestamp":"2022-08-05T21:12:29.405153171Z",'
+                 b'"details":[{"@type":"type.googleapis.com/errorstatus.v1.UserFacingErrorInfo","reason":"INTERNAL","metadata":{},"message":"Internal server error.","resolution":"Please retry and if the error persists contact support at support@veza.com"}]}')
+_ERR_INVALID_ARG = (b'{"code":"InvalidArgument",'
+                    b'"message":"Invalid Arguments",'
+                    b'"request_id":"1091d23a67ad44a63723fc050280e5ae",'
+                    b'"timestamp":"2022-08-05T19:59:11.508388808Z",'
+                    b'"details":[{"@type":"type.googleapis.com/google.rpc.BadRequest","field_violations":[{"field":"name","description":"Provider with the same name already exists"}]},{"@type":"type.googleapis.com/errorstatus.v1.UserFacingErrorInfo","reason":"INVALID_ARGUMENTS","metadata":{},"message":"Request includes invalid arguments.","resolution":"Reference error details for the exact field violations."}]}')
+_ERR_NOT_FOUND = (b'{"code":"NotFound",'
+                  b'"message":"Not Found",'
+                  b'"request_id":"1de5e43499c90f2036cdfe92ed76f58e",'
+                  b'"timestamp":"2022-08-05T21:06:53.046972349Z",'
+                  b'"details":[{"@type":"type.googleapis.com/errorstatus.v1.ResourceInfo","resource_type":"datasource","resource":"b1e654e7-2104-4180-9dee-2f76e2b52463"},{"@type":"type.googleapis.com/errorstatus.v1.UserFacingErrorInfo","reason":"NOT_FOUND","metadata":{},"message":"Requested resource was not found.","resolution":""}]}')
+_ERR_INVALID_ROLE = (b'{"code":"InvalidArgument",'
+                     b'"message":"Invalid Arguments",'
+                     b'"request_id":"171d043ee1f2bd1ed6f2881f5fc4c505",'
+                     b'"timestamp":"2022-08-05T19:33:38.838666103Z",'
+                     b'"details":[{"@type":"type.googleapis.com/google.rpc.BadRequest","field_violations":[{"field":"identity_to_permissions.role_assignments.role","description":"Can\'t connect identity to role as role not found for application (application: SampleApp, role: Administrator, identity: my_user)"}]},{"@type":"type.googleapis.com/errorstatus.v1.UserFacingErrorInfo","reason":"INVALID_ARGUMENTS","metadata":{},"message":"Request includes invalid arguments.","resolution":"Reference error details for the exact field violations."}]}')
+
+# paginated API responses for mocked responses
+_PAGES = {
+    "values": (b'{"values": ["1", "2", "3"], "has_more": true, "next_page_token": "page2"}',
+               b'{"values": ["4", "5", "6"], "has_more": true, "next_page_token": "page3"}',
+               b'{"values": ["7", "8"], "has_more": false}'),
+    "path_values": (b'{"values": [], "path_values": ["1", "2", "3"], "has_more": true, "next_page_token": "page2"}',
+                    b'{"values": [], "path_values": ["4", "5", "6"], "has_more": true, "next_page_token": "page3"}',
+                    b'{"values": [], "path_values": ["7", "8"], "has_more": false}')
+}
+_PAGED_VALUES = ["1", "2", "3", "4", "5", "6", "7", "8"]
+_EMPTY_PAGE = b'{"values": [], "has_more": false}'
+_VALUE_PAGE = b'{"value": {"id": "thing"}, "has_more": false}'
+
+# query definition for the live query and report tests, tests add the query name, nested values must not be modified
+_TEST_QUERY_TEMPLATE = {
+    "description": "Pytest Generated",
+    "category": "IDP_ANALYSIS",
+    "level": "BASIC",
+    "result_type": "NUMBER",
+    "query_type": "SOURCE_TO_DESTINATION",
+    "source_node_types": {
+        "nodes": [
+            {
+                "node_type": "OktaUser",
+                "tags": [],
+                "conditions": [],
+                "node_id": "",
+                "excluded_tags": [],
+                "count_conditions": []
+            }
+        ],
+        "nodes_operator": "AND"
+    }
+}
+
+# single object API responses for mocked responses
+_CREATED_PROVIDER = b'{"value": {"id": "123", "name": "TestExtra"}}'
+_PUSH_RESULT = b'{"id": "987"}'
+
+# urllib3 responses for mocking the connection pool, the failure response has no body and can be reused
+_BAD_HTTPRESP = urllib3.response.HTTPResponse(status=500, reason="Failure", request_url="/api/should/fail")
+
+
+class _CachedBody:
+    """Response body that returns the cached bytes on the first read without copying"""
+    __slots__ = ("_body", "_pos")
+
+    def __init__(self, body: bytes):
+        self._body = body
+        self._pos = 0
+
+    def read(self, amt: int = -1) -> bytes:
+        if self._pos:
+            return b""
+        self._pos = len(self._body)
+        return self._body
+
+    @property
+    def closed(self) -> bool:
+        return bool(self._pos)
+
+    def close(self) -> None:
+        pass
+
+
+_GOOD_BODY = b'{"message": "ok"}'
+
+
+def _good_httpresp() -> urllib3.response.HTTPResponse:
+    """Returns a new successful urllib3 response, body can only be read once"""
+    headers = {"Content-Type": "application/json", "Content-Length": str(len(_GOOD_BODY))}
+    return urllib3.response.HTTPResponse(_CachedBody(_GOOD_BODY), status=200, request_url="/api/should/work", headers=headers, preload_content=False)
+
+
+class _FakeResponse:
+    """Lightweight stand-in for `requests.Response` returned by mocked `requests.Session.request` calls
+
+    Only implements the parts of the response used by `OAAClient` to process API responses.
+    """
+
+    __slots__ = ("status_code", "_content", "reason", "url", "headers")
+
+    def __init__(self, content: bytes, status_code: int = 200, reason: str = None, url: str = "https://noreply.vezacloud.com") -> None:
+        self.status_code = status_code
+        self._content = content
+        self.reason = reason
+        self.url = url
+        self.headers = {}
+
+    def __bool__(self) -> bool:
+        return self.ok
+
+    @property
+    def ok(self) -> bool:
+        return self.status_code < 400
 
-# enable debug logging
-logging.basicConfig(level=logging.DEBUG)
-log = logging.getLogger()
-log.setLevel(logging.DEBUG)
+    @property
+    def content(self) -> bytes:
+        return self._content
 
+    @property
+    def text(self) -> str:
+        return self._content.decode()
 
-@pytest.mark.skipif(not os.getenv("PYTEST_VEZA_HOST"), reason="Test host is not configured")
-def test_client_provider(veza_con):
+    def json(self):
+        try:
+            return json.loads(self._content)
+        except json.JSONDecodeError as e:
+            raise requests.exceptions.JSONDecodeError(e.msg, e.doc, e.pos)
+
+    def raise_for_status(self) -> None:
+        if not self.ok:
+            raise requests.exceptions.HTTPError(f"{self.status_code} Error: {self.reason} for url: {self.url}", response=self)
+
+
+def _mock_pages(mock_request, pages: list) -> None:
+    """Set the mocked request to return each of the pages in order"""
+    mock_request.side_effect = (_FakeResponse(page) for page in pages)
+
+
+@pytest.mark.live
+def test_client_provider(veza_con, unique_name):
     """ tests for client provider management code using live API
 
     Does not use the app_provider fixture since this includes all the additional validations
     and tests around provider create/delete behavior
     """
-    test_uuid = uuid.uuid4()
-    provider_name = f"Pytest-{test_uuid}"
+    provider_name = unique_name("Pytest")
 
     all_providers = veza_con.get_provider_list()
     assert isinstance(all_providers, list)
@@ -78,20 +216,15 @@ def test_client_provider(veza_con):
     print(deleted_provider)
     assert deleted
 
-@pytest.mark.skipif(not os.getenv("PYTEST_VEZA_HOST"), reason="Test host is not configured")
-def test_client_data_source(veza_con):
+@pytest.mark.live
+def test_client_data_source(veza_con, app_provider):
     """ tests for client data source management code using live API """
 
-    test_uuid = uuid.uuid4()
-    provider_name = f"Pytest-{test_uuid}"
-    created_provider = veza_con.create_provider(provider_name, "application")
-    assert created_provider is not None
-    assert created_provider.get("id") is not None
-
-    provider_id = created_provider["id"]
+    provider_id = app_provider["id"]
     existing_data_sources = veza_con.get_data_sources(provider_id)
-    # newly created provider should have no data sources
-    assert existing_data_sources == []
+    # provider is shared by the test session, other tests may have already created data sources
+    assert isinstance(existing_data_sources, list)
+    starting_count = len(existing_data_sources)
 
     not_created = veza_con.get_data_source(name="not created", provider_id=provider_id)
     # expect none for a data source we know doesn't exist yet
@@ -116,7 +249,7 @@ def test_client_data_source(veza_con):
     assert data_source_1_info.get("id") is not None
 
     data_source_list = veza_con.get_data_sources(provider_id)
-    assert len(data_source_list) == 2
+    assert len(data_source_list) == starting_count + 2
 
     # test delete
     delete_response = veza_con.delete_data_source(data_source_id=data_source_1["id"], provider_id=provider_id)
@@ -132,97 +265,70 @@ def test_client_data_source(veza_con):
 
     assert deleted
 
-    # delete provider for cleanup
-    veza_con.delete_provider(provider_id)
-
 
 @pytest.mark.parametrize("url",["https://noreply.vezacloud.com", "noreply.vezacloud.com", "noreply.vezacloud.com/", "https://noreply.vezacloud.com/"])
 def test_url_formatter(url):
-    test_api_key = "1234"
-    with patch.object(OAAClient, "_test_connection", return_value=None):
-        veza_con = OAAClient(url=url, token=test_api_key)
-
-        assert veza_con.url == "https://noreply.vezacloud.com"
-
-@patch.object(requests.Session, "request")
-def test_api_get_error(mock_session_get):
-    # Test that the correct OAAClient exception is raised on properly populated
-
-    test_api_key = "1234"
-    # patch _test_connection to instantiate a connection object
-    with patch.object(OAAClient, "_test_connection", return_value=None):
-        veza_con = OAAClient(url="https://noreply.vezacloud.com", token=test_api_key)
-
-
-    mock_response = Response()
-    mock_response.status_code = 400
-    error_message = b"""
-                    {
-                        "code": "Internal",
-                        "message": "Internal Server Error, please retry and if the error persists contact support at support@veza.com",
-                        "request_id": "2271c08a9abd3b425c88a397b01bb351",
-                        "timestamp": "2022-08-05T21:12:29.405153171Z",
-                        "details": [
-                            {
-                                "@type": "type.googleapis.com/errorstatus.v1.UserFacingErrorInfo",
-                                "reason": "INTERNAL",
-                                "metadata": {},
-                                "message": "Internal server error.",
-                                "resolution": "Please retry and if the error persists contact support at support@veza.com"
-                            }
-                        ]
-                    }
-                    """
-    mock_response._content = error_message
-    mock_session_get.return_value = mock_response
+    veza_con = MockOAAClient(url=url, token="1234")
+
+    assert veza_con.url == "https://noreply.vezacloud.com"
+
+@pytest.mark.parametrize("method,kwargs,status,content,reason,expected_error,expected_message,expected_detail",
+                         [
+                            ("api_get", {}, 400, _ERR_INTERNAL, None, "Internal", "Internal Server Error, please retry and if the error persists contact support at support@veza.com", "Internal server error."),
+                            ("api_get", {}, 500, _NOT_JSON, "Error Reason", "ERROR", "Error reason: Error Reason", None),
+                            ("api_get", {}, 200, _NOT_JSON, None, "ERROR", "Response not JSON", None),
+                            ("api_post", {"data": {}}, 400, _ERR_INVALID_ARG, None, "InvalidArgument", "Invalid Arguments", "Provider with the same name already exists"),
+                            ("api_post", {"data": {}}, 500, _NOT_JSON, "Error Reason", "ERROR", "Error reason: Error Reason", None),
+                            ("api_delete", {}, 404, _ERR_NOT_FOUND, None, "NotFound", "Not Found", "Requested resource was not found."),
+                            ("api_delete", {}, 500, _NOT_JSON, "Error Reason", "ERROR", "Error reason: Error Reason", None),
+                         ],
+                         ids=["get", "get_nonjson", "get_nonjson_success", "post", "post_nonjson", "delete", "delete_nonjson"]
+                        )
+def test_api_error(mock_veza_con, mock_session_request, method, kwargs, status, content, reason, expected_error, expected_message, expected_detail):
+    # Test that the correct OAAClient exception is raised and populated for Veza errors and non-JSON responses
+
+    mock_session_request.return_value = _FakeResponse(content, status_code=status, reason=reason)
 
     with pytest.raises(OAAClientError) as e:
-        response = veza_con.api_get("/api/path")
+        getattr(mock_veza_con, method)("/api/path", **kwargs)
 
-    # test that the error is populated property
-    assert e.value.error == "Internal"
-    assert e.value.message == "Internal Server Error, please retry and if the error persists contact support at support@veza.com"
-    assert e.value.status_code == 400
-    assert len(e.value.details) == 1
-    assert "Internal server error." in str(e.value.details)
+    # test that the error is populated properly
+    assert e.value.error == expected_error
+    assert e.value.message == expected_message
+    assert e.value.status_code == status
+    if expected_detail:
+        assert expected_detail in str(e.value.details)
+    else:
+        assert e.value.details == []
 
 @patch("urllib3.connectionpool.HTTPConnectionPool._make_request")
-@patch("time.sleep", return_value=None)
-def test_api_get_retry(mock_sleep, mock_make_request):
-    # test that the retry logic behaves correctly, that it retries the right number of times and that total time is within our expected
-    test_api_key = "1234"
-    # patch _test_connection to instantiate a connection object
-    with patch.object(OAAClient, "_test_connection", return_value=None):
-        veza_con = OAAClient(url="https://noreply.vezacloud.com", token=test_api_key)
+@patch("urllib3.util.retry.Retry.sleep", return_value=None)
+def test_api_get_retry(mock_retry_sleep, mock_make_request, mock_veza_con):
+    # test that the retry logic behaves correctly and that it retries the right number of times, back off times are
+    # validated by test_api_retry_backoff
+    veza_con = mock_veza_con
 
     url = "/api/should/fail"
 
-    bad = urllib3.response.HTTPResponse(status=500, reason="Failure", request_url=url)
-    mock_make_request.return_value = bad
+    mock_make_request.return_value = _BAD_HTTPRESP
 
-    with pytest.raises(OAAConnectionError) as e:
+    with pytest.raises(OAAConnectionError, match="Max retries exceeded") as e:
         response = veza_con.api_get(url)
 
-    # ten retries (default) would require nine sleep back off calls
-    assert mock_sleep.call_count == 9
-    sleep_times = [c.args[0] for c in mock_sleep.call_args_list]
-    assert sum(sleep_times) == 157.2
+    # initial request and ten retries (default), with a back off before each retry
+    assert mock_make_request.call_count == 11
+    assert mock_retry_sleep.call_count == 10
 
     # test that the error is populated property
     assert e.value.error == "ERROR"
-    assert "Max retries exceeded" in e.value.message
 
     # test that retry to good works correct, two bad responses and a good
     url = "/api/should/work"
 
     mock_make_request.reset_mock()
 
-    response_body = io.BytesIO(b'{"message": "ok"}')
-    headers={"Content-Type": "application/json", "Content-Length": "17"}
-    good = urllib3.response.HTTPResponse(response_body, status=200, request_url=url, headers=headers, preload_content=False)
-
     # two bad responses then a good should result in no exceptions raised to caller
-    mock_make_request.side_effect = [bad, bad, good]
+    mock_make_request.side_effect = [_BAD_HTTPRESP, _BAD_HTTPRESP, _good_httpresp()]
 
     # test that the api get will retry to get to the good response
     response = veza_con.api_get(url)
@@ -231,277 +337,56 @@ def test_api_get_retry(mock_sleep, mock_make_request):
 
     return
 
-@patch.object(requests.Session, "request")
-def test_api_get_nonjson_error(mock_session_get):
-    # Test that the OAAClient correctly handles a non-JSON respponse if error isn't coming from Veza stack
-
-    test_api_key = "1234"
-    url = "https://noreply.vezacloud.com"
-    # patch _test_connection to instantiate a connection object
-    with patch.object(OAAClient, "_test_connection", return_value=None):
-        veza_con = OAAClient(url=url, token=test_api_key)
-
-    # Mock a response with non-JSON data, will force a JSONDecodeError
-    mock_response = Response()
-    mock_response.status_code = 500
-    mock_response._content = b"This is not json"
-    mock_response.reason = "Error Reason"
-    mock_response.url = url
-
-    mock_session_get.return_value = mock_response
-
-    with pytest.raises(OAAClientError) as e:
-        veza_con.api_get("/api/path")
-
-    # should recieve the generic error message
-    assert e.value.error == "ERROR"
-    assert "Error Reason" in e.value.message
-    assert e.value.status_code == 500
-
-@patch.object(requests.Session, "request")
-def test_api_get_nonjson_success(mock_session_get):
-    # Test that the OAAClient raises the correct error if somehow it gets a successful HTTP response that is not JSON
-
-    test_api_key = "1234"
-    url = "https://noreply.vezacloud.com"
-    # patch _test_connection to instantiate a connection object
-    with patch.object(OAAClient, "_test_connection", return_value=None):
-        veza_con = OAAClient(url=url, token=test_api_key)
-
-    # Mock a response with non-JSON data, will force a JSONDecodeError
-    mock_response = Response()
-    mock_response.status_code = 200
-    mock_response._content = b"This is not json"
-    mock_response.url = url
+def test_api_retry_backoff(mock_veza_con):
+    # test that the back off times between retries match the client retry policy, computed from the policy directly
+    # without making any requests
+    retry = mock_veza_con._http_adapter.get_adapter(mock_veza_con.url).max_retries
 
-    mock_session_get.return_value = mock_response
-
-    with pytest.raises(OAAClientError) as e:
-        veza_con.api_get("/api/path")
-
-    # should receive the generic error message
-    assert e.value.error == "ERROR"
-    assert e.value.message == "Response not JSON"
-    assert e.value.status_code == 200
-
-@patch.object(requests.Session, "request")
-def test_api_post_error(mock_session_post):
-    # Test that the correct OAAClient exception is raised on properly populated
-
-    test_api_key = "1234"
-    # patch _test_connection to instantiate a connection object
-    with patch.object(OAAClient, "_test_connection", return_value=None):
-        veza_con = OAAClient(url="https://noreply.vezacloud.com", token=test_api_key)
-
-
-    mock_response = Response()
-    mock_response.status_code = 400
-    error_message = b"""
-            {
-                "code": "InvalidArgument",
-                "message": "Invalid Arguments",
-                "request_id": "1091d23a67ad44a63723fc050280e5ae",
-                "timestamp": "2022-08-05T19:59:11.508388808Z",
-                "details": [
-                    {
-                    "@type": "type.googleapis.com/google.rpc.BadRequest",
-                    "field_violations": [
-                        {
-                        "field": "name",
-                        "description": "Provider with the same name already exists"
-                        }
-                    ]
-                    },
-                    {
-                    "@type": "type.googleapis.com/errorstatus.v1.UserFacingErrorInfo",
-                    "reason": "INVALID_ARGUMENTS",
-                    "metadata": {},
-                    "message": "Request includes invalid arguments.",
-                    "resolution": "Reference error details for the exact field violations."
-                    }
-                ]
-            }
-            """
-    mock_response._content = error_message
-
-    mock_session_post.return_value = mock_response
-
-    with pytest.raises(OAAClientError) as e:
-        veza_con.api_post("/api/path", data={})
-
-    # test that the error is populated propery
-    assert e.value.error == "InvalidArgument"
-    assert e.value.message == "Invalid Arguments"
-    assert e.value.status_code == 400
-    assert e.value.details != []
-    assert "Provider with the same name already exists" in str(e.value.details)
-
-@patch.object(requests.Session, "request")
-def test_api_post_nonjson_error(mock_session_post):
-    # Test that the OAAClient correctly handles a non-JSON respponse if error isn't coming from Veza stack
-
-    test_api_key = "1234"
-    url = "https://noreply.vezacloud.com"
-    # patch _test_connection to instantiate a connection object
-    with patch.object(OAAClient, "_test_connection", return_value=None):
-        veza_con = OAAClient(url=url, token=test_api_key)
-
-    # Mock a response with non-JSON data, will force a JSONDecodeError
-    mock_response = Response()
-    mock_response.status_code = 500
-    mock_response._content = b"This is not json"
-    mock_response.reason = "Error Reason"
-    mock_response.url = url
-
-    mock_session_post.return_value = mock_response
-
-    with pytest.raises(OAAClientError) as e:
-        veza_con.api_post("/api/path", data={})
-
-    # should recieve the generic error message
-    assert e.value.error == "ERROR"
-    assert "Error Reason" in e.value.message
-    assert e.value.status_code == 500
-
-@patch.object(requests.Session, "request")
-def test_api_delete_error(mock_session_delete):
-    # Test that the correct OAAClient exception is raised on properly populated
-
-    test_api_key = "1234"
-    # patch _test_connection to instantiate a connection object
-    with patch.object(OAAClient, "_test_connection", return_value=None):
-        veza_con = OAAClient(url="https://noreply.vezacloud.com", token=test_api_key)
-
-
-    mock_response = Response()
-    mock_response.status_code = 404
-    error_message = b"""
-            {
-                "code": "NotFound",
-                "message": "Not Found",
-                "request_id": "1de5e43499c90f2036cdfe92ed76f58e",
-                "timestamp": "2022-08-05T21:06:53.046972349Z",
-                "details": [
-                    {
-                    "@type": "type.googleapis.com/errorstatus.v1.ResourceInfo",
-                    "resource_type": "datasource",
-                    "resource": "b1e654e7-2104-4180-9dee-2f76e2b52463"
-                    },
-                    {
-                    "@type": "type.googleapis.com/errorstatus.v1.UserFacingErrorInfo",
-                    "reason": "NOT_FOUND",
-                    "metadata": {},
-                    "message": "Requested resource was not found.",
-                    "resolution": ""
-                    }
-                ]
-            }
-            """
-    mock_response._content = error_message
-    mock_session_delete.return_value = mock_response
-
-    with pytest.raises(OAAClientError) as e:
-        veza_con.api_delete("/api/path")
-
-    # test that the error is populated propery
-    assert e.value.error == "NotFound"
-    assert e.value.message == "Not Found"
-    assert e.value.status_code == 404
-    assert e.value.details != []
-    assert "Requested resource was not found." in str(e.value.details)
-
-@patch.object(requests.Session, "request")
-def test_api_post_delete_error(mock_session_delete):
-    # Test that the OAAClient correctly handles a non-JSON response if error isn't coming from Veza stack
-
-    test_api_key = "1234"
-    url = "https://noreply.vezacloud.com"
-    # patch _test_connection to instantiate a connection object
-    with patch.object(OAAClient, "_test_connection", return_value=None):
-        veza_con = OAAClient(url=url, token=test_api_key)
-
-    # Mock a response with non-JSON data, will force a JSONDecodeError
-    mock_response = Response()
-    mock_response.status_code = 500
-    mock_response._content = b"This is not json"
-    mock_response.reason = "Error Reason"
-    mock_response.url = url
-
-    mock_session_delete.return_value = mock_response
-
-    with pytest.raises(OAAClientError) as e:
-        veza_con.api_delete("/api/path")
-
-    # should receive the generic error message
-    assert e.value.error == "ERROR"
-    assert "Error Reason" in e.value.message
-    assert e.value.status_code == 500
+    backoff_times = []
+    for _ in range(retry.total):
+        retry = retry.increment(method="GET", url="/api/should/fail", response=_BAD_HTTPRESP)
+        backoff_times.append(retry.get_backoff_time())
 
+    # no back off before the first retry, then {backoff factor} * (2 ^ ({retry number} - 1)) up to the max back off
+    expected_backoffs = [0] + [min(OAAClient.DEFAULT_RETRY_MAX_BACKOFF, OAAClient.DEFAULT_RETRY_BACKOFF_FACTOR * 2 ** i)
+                               for i in range(1, OAAClient.DEFAULT_RETRY_COUNT)]
+    assert backoff_times == pytest.approx(expected_backoffs)
 
-@patch('oaaclient.client.requests')
 @patch.object(OAAClient, "get_provider", return_value={"id": "123"})
 @patch.object(OAAClient, "get_data_source", return_value={"id": "123"})
-def test_large_payload(mock_requests, mock_get_provider, mock_get_data_source):
+def test_large_payload(mock_get_data_source, mock_get_provider, mock_veza_con, monkeypatch):
     """Test large payload exception
 
     Assert that a payload that would be larger than 100MB will throw an exception
 
     """
-    test_api_key = "1234"
-    url = "https://noreply.vezacloud.com"
-
-    mock_response = Response()
-    mock_response.status_code = 200
-    mock_response._content = b"""{"id": "123"}"""
-    mock_response.url = url
-
-    mock_requests.get.return_value = mock_response
-    mock_requests.post.return_value = mock_response
-
-    with patch.object(OAAClient, "_test_connection", return_value=None):
-        veza_con = OAAClient(url=url, token=test_api_key)
+    veza_con = mock_veza_con
 
     # disable compression to make it easier to create a large payload
-    veza_con.enable_compression = False
+    monkeypatch.setattr(veza_con, "enable_compression", False)
 
     big = "=" * 100_000_001
     payload = {"data": big}
-    with pytest.raises(OAAClientError) as e:
+    with pytest.raises(OAAClientError, match="Payload size exceeds maximum size of 100MB") as e:
         veza_con.push_metadata("provider_name", "data_source_name", metadata=payload, save_json=False)
 
     assert e.value.error == "OVERSIZE"
-    assert "Payload size exceeds maximum size of 100MB" in e.value.message
 
 
-@patch('oaaclient.client.requests')
 @patch.object(OAAClient, "get_provider", return_value={"id": "123"})
 @patch.object(OAAClient, "get_data_source", return_value={"id": "123"})
-def test_compression(mock_requests, mock_get_provider, mock_get_data_source):
-    """Test large payload exception
+def test_compression(mock_get_data_source, mock_get_provider, mock_veza_con, monkeypatch, sample_app):
+    """Test payload compression
 
-    Assert that a payload that would be larger than 100MB will throw an exception
+    Assert that the payload is sent compressed and base64 encoded when compression is enabled
 
     """
-    test_api_key = "1234"
-    url = "https://noreply.vezacloud.com"
+    veza_con = mock_veza_con
 
-    mock_response = Response()
-    mock_response.status_code = 200
-    mock_response._content = b"""{"id": "123"}"""
-    mock_response.url = url
-
-    mock_requests.get.return_value = mock_response
-    mock_requests.post.return_value = mock_response
-
-    with patch.object(OAAClient, "_test_connection", return_value=None):
-        veza_con = OAAClient(url=url, token=test_api_key)
-
-    veza_con.enable_compression = True
-
-    app = generate_app()
+    monkeypatch.setattr(veza_con, "enable_compression", True)
 
     with patch.object(veza_con, "api_post") as post_mock:
-        veza_con.push_application("provider_name", "data_source_name", application_object=app, save_json=False)
+        veza_con.push_application("provider_name", "data_source_name", application_object=sample_app, save_json=False)
 
     assert post_mock.called
     call = post_mock.mock_calls[0]
@@ -510,52 +395,36 @@ def test_compression(mock_requests, mock_get_provider, mock_get_data_source):
     payload = call.args[1]
     # assert compression_type is set in the payload correctly
     assert payload['compression_type'] == "GZIP"
-    # assert that the payload is base64 encoded by trying to decode
-    assert base64.b64decode(payload['json_data'])
-
-
-@patch.object(requests.Session, "request")
-def test_request_exceptions(mock_session):
-
-    test_api_key = "1234"
-    url = "https://noreply.vezacloud.com"
-    # patch _test_connection to instantiate a connection object
-    with patch.object(OAAClient, "_test_connection", return_value=None):
-        veza_con = OAAClient(url=url, token=test_api_key)
-
-    # Mock a response with non-JSON data, will force a JSONDecodeError
-    mock_response = Response()
-    mock_response.status_code = 401
-    mock_response._content = b"""
-    {
-        "code": "InvalidArgument",
-        "message": "Invalid Arguments",
-        "request_id": "171d043ee1f2bd1ed6f2881f5fc4c505",
-        "timestamp": "2022-08-05T19:33:38.838666103Z",
-        "details": [
-            {
-            "@type": "type.googleapis.com/google.rpc.BadRequest",
-            "field_violations": [
-                {
-                "field": "identity_to_permissions.role_assignments.role",
-                "description": "Can't connect identity to role as role not found for application (application: SampleApp, role: Administrator, identity: my_user)"
-                }
-            ]
-            },
-            {
-            "@type": "type.googleapis.com/errorstatus.v1.UserFacingErrorInfo",
-            "reason": "INVALID_ARGUMENTS",
-            "metadata": {},
-            "message": "Request includes invalid arguments.",
-            "resolution": "Reference error details for the exact field violations."
-            }
-        ]
-    }
+    # assert that the payload is base64 encoded gzip of the application payload
+    assert json.loads(gzip.decompress(base64.b64decode(payload['json_data']))) == sample_app.get_payload()
+
+
+@patch.object(OAAClient, "get_provider", return_value={"id": "123"})
+@patch.object(OAAClient, "get_data_source", return_value={"id": "123"})
+def test_compression_small_payload(mock_get_data_source, mock_get_provider, mock_veza_con, monkeypatch):
+    """Test small payloads are not compressed
+
+    Assert that a payload smaller than the compression minimum size is sent uncompressed with compression enabled
+
     """
-    mock_response.reason = "InvalidArgument"
-    mock_response.url = "https://noreply.vezacloud.com/api/v1/call"
+    veza_con = mock_veza_con
+
+    monkeypatch.setattr(veza_con, "enable_compression", True)
+
+    metadata = {"applications": []}
+    with patch.object(veza_con, "api_post") as post_mock:
+        veza_con.push_metadata("provider_name", "data_source_name", metadata=metadata)
 
-    mock_session.return_value = mock_response
+    payload = post_mock.call_args.args[1]
+    assert "compression_type" not in payload
+    assert json.loads(payload['json_data']) == metadata
+
+
+def test_request_exceptions(mock_veza_con, mock_session_request):
+
+    veza_con = mock_veza_con
+
+    mock_session_request.return_value = _FakeResponse(_ERR_INVALID_ROLE, status_code=401, reason="InvalidArgument", url="https://noreply.vezacloud.com/api/v1/call")
 
     with pytest.raises(OAAResponseError) as e:
         veza_con.api_delete("/api/path")
@@ -580,22 +449,21 @@ def test_exception_hierarchy():
     with pytest.raises(OAAClientError) as e:
         raise OAAResponseError("test error", message="test")
 
-    assert e is not None
     assert isinstance(e.value, OAAClientError)
     assert isinstance(e.value, OAAResponseError)
 
     with pytest.raises(OAAClientError) as e:
         raise OAAConnectionError("connection error", message="test")
 
-    assert e is not None
     assert isinstance(e.value, OAAClientError)
     assert isinstance(e.value, OAAConnectionError)
 
 
-def test_connection_test():
+@patch("socket.getaddrinfo", side_effect=socket.gaierror("Unknown host"))
+def test_connection_test(mock_getaddrinfo):
     """Ensure that connection test fails fast with a bad URL
 
-    Test should successfully fail faster than the timeout
+    DNS lookup is mocked to fail so the test does not depend on the resolver
     """
 
     with pytest.raises(OAAConnectionError) as e:
@@ -604,8 +472,9 @@ def test_connection_test():
     assert isinstance(e.value, OAAConnectionError)
     # ensure that the connection test failed because of the DNS error
     assert e.value.error == "Unknown host"
+    mock_getaddrinfo.assert_called_once_with("host.invalid.com", 0)
 
-@pytest.mark.skipif(not os.getenv("PYTEST_VEZA_HOST"), reason="Test host is not configured")
+@pytest.mark.live
 @pytest.mark.timeout(10)
 def test_bad_api_key():
     """Ensure test fails with invalid API key
@@ -614,12 +483,8 @@ def test_bad_api_key():
     """
 
     test_deployment = os.getenv("PYTEST_VEZA_HOST", "")
-    test_api_key = os.getenv("VEZA_API_KEY", "")
-
-    decoded = base64.b64decode(test_api_key)
-    mangled = str(decoded[:4]) + "XXXX"
-    test_api_key = base64.b64encode(decoded)
-    # test_api_key = test_api_key.replace(test_api_key[:4], "XXXX")
+    # valid base64 but not a real API key
+    test_api_key = "XXXXXXXXXXXXXXXXXXXXXXXX="
 
     log.debug(f"Test bad API key value: {test_api_key=}")
     with pytest.raises(OAAClientError) as e:
@@ -629,257 +494,87 @@ def test_bad_api_key():
     assert e.value.status_code == 401
 
 
-@patch.object(requests.Session, "request")
-def test_api_paging_get(mock_request):
-
-    test_api_key = "1234"
-    url = "https://noreply.vezacloud.com"
-
-    with patch.object(OAAClient, "_test_connection", return_value=None):
-        veza_con = OAAClient(url=url, token=test_api_key)
-
-    # build some fake pages
-    page_1 = b"""{"values": ["1", "2", "3"], "has_more": true, "next_page_token": "page2"}"""
-    page_2 = b"""{"values": ["4", "5", "6"], "has_more": true, "next_page_token": "page3"}"""
-    page_3 = b"""{"values": ["7", "8"], "has_more": false}"""
-
-    responses = []
-
-    for page in [page_1, page_2, page_3]:
-        mock_response = Response()
-        mock_response.status_code = 200
-        mock_response._content = page
-        mock_response.url = url
-
-        responses.append(mock_response)
-
-    mock_request.side_effect = responses
-
-    providers = veza_con.get_provider_list()
-
-    assert providers == ["1", "2", "3", "4", "5", "6", "7", "8"]
-
-    # assert that it made three request calls to get through all the pages
-    assert mock_request.call_count == 3
-
-    # check that the page_token parame is set correctly on each of the three expected API calls
-    call_1 = mock_request.call_args_list[0]
-    assert "page_size" in call_1.kwargs.get("params")
-
-    call_2 = mock_request.call_args_list[1]
-    assert "page_token=page2" in call_2.kwargs.get("params")
-    assert "page_size" in call_2.kwargs.get("params")
-
-    call_3 = mock_request.call_args_list[0]
-    assert "page_size" in call_3.kwargs.get("params")
-
-@patch.object(requests.Session, "request")
-def test_api_paging_get_value(mock_request):
-
-    test_api_key = "1234"
-    url = "https://noreply.vezacloud.com"
-
-    with patch.object(OAAClient, "_test_connection", return_value=None):
-        veza_con = OAAClient(url=url, token=test_api_key)
-
-    mock_response = Response()
-    mock_response.status_code = 200
-    mock_response._content = b"""{"value": {"id": "thing"}, "has_more": false}"""
-    mock_response.url = url
-
-    mock_request.side_effect = [mock_response]
+@pytest.mark.parametrize("method,kwargs,pages,expected",
+                         [
+                             ("api_get", {"params": {"page_size": 250}}, _PAGES["values"], _PAGED_VALUES),
+                             ("api_get", {}, (_EMPTY_PAGE,), []),
+                             ("api_post", {"data": {}}, _PAGES["values"], _PAGED_VALUES),
+                             ("api_post", {"data": {}}, _PAGES["path_values"], _PAGED_VALUES),
+                             ("api_post", {"data": {}}, (_EMPTY_PAGE,), []),
+                             ("api_put", {"data": {}}, _PAGES["values"], _PAGED_VALUES),
+                             ("api_put", {"data": {}}, (_EMPTY_PAGE,), []),
+                         ],
+                         ids=["get", "get_empty", "post", "post_path_values", "post_empty", "put", "put_empty"]
+                        )
+def test_api_paging(mock_veza_con, mock_session_request, method, kwargs, pages, expected):
+    # test that paginated responses are collected into a single list, API calls update the `params` dict passed in
+    params = dict(kwargs.get("params", {}))
+    if "params" in kwargs:
+        # pass a copy so the parametrize data is not updated with the page token
+        kwargs = {**kwargs, "params": dict(params)}
 
-    thing = veza_con.api_get("/mock/call")
-    assert mock_request.call_count == 1
+    _mock_pages(mock_session_request, pages)
 
-    assert thing == {"id": "thing"}
-    return
-
-@patch.object(requests.Session, "request")
-def test_api_paging_post(mock_request):
-
-    test_api_key = "1234"
-    url = "https://noreply.vezacloud.com"
-
-    with patch.object(OAAClient, "_test_connection", return_value=None):
-        veza_con = OAAClient(url=url, token=test_api_key)
-
-    # build some fake pages
-    page_1 = b"""{"values": ["1", "2", "3"], "has_more": true, "next_page_token": "page2"}"""
-    page_2 = b"""{"values": ["4", "5", "6"], "has_more": true, "next_page_token": "page3"}"""
-    page_3 = b"""{"values": ["7", "8"], "has_more": false}"""
-
-    responses = []
-
-    for page in [page_1, page_2, page_3]:
-        mock_response = Response()
-        mock_response.status_code = 200
-        mock_response._content = page
-        mock_response.url = url
-
-        responses.append(mock_response)
-
-    mock_request.side_effect = responses
-
-    result = veza_con.api_post("/fake/url", data={})
-
-    assert result == ["1", "2", "3", "4", "5", "6", "7", "8"]
-
-    # assert that it made three request calls to get through all the pages
-    assert mock_request.call_count == 3
-
-    # check that the page_token params is set correctly on each of the three expected API calls
-    # first call should have no page size
-    call_1 = mock_request.call_args_list[0]
-    assert call_1.kwargs.get("params") is None
-
-    call_2 = mock_request.call_args_list[1]
-    assert "page_token=page2" in call_2.kwargs.get("params")
-
-    call_3 = mock_request.call_args_list[2]
-    assert "page_token=page3" in call_3.kwargs.get("params")
-
-@patch.object(requests.Session, "request")
-def test_api_paging_post_path_values(mock_request):
-
-    # test for paging when the API is returning `path_values`
-
-    test_api_key = "1234"
-    url = "https://noreply.vezacloud.com"
-
-    with patch.object(OAAClient, "_test_connection", return_value=None):
-        veza_con = OAAClient(url=url, token=test_api_key)
-
-    # build some fake pages
-    page_1 = b"""{"values": [], "path_values": ["1", "2", "3"], "has_more": true, "next_page_token": "page2"}"""
-    page_2 = b"""{"values": [], "path_values": ["4", "5", "6"], "has_more": true, "next_page_token": "page3"}"""
-    page_3 = b"""{"values": [], "path_values": ["7", "8"], "has_more": false}"""
-
-    responses = []
-
-    for page in [page_1, page_2, page_3]:
-        mock_response = Response()
-        mock_response.status_code = 200
-        mock_response._content = page
-        mock_response.url = url
+    result = getattr(mock_veza_con, method)("/fake/url", **kwargs)
 
-        responses.append(mock_response)
+    assert result == expected
 
-    mock_request.side_effect = responses
+    # assert that it made one request call per page
+    assert mock_session_request.call_count == len(pages)
 
-    result = veza_con.api_post("/fake/url", data={})
+    # check that the page_token params is set correctly on each API call along with the original params, first call
+    # should have no page token and each following call uses the token from the page before it
+    page_tokens = [json.loads(page)["next_page_token"] for page in pages[:-1]]
+    call_params = [c.kwargs.get("params") for c in mock_session_request.call_args_list]
+    assert call_params == [urlencode(params) or None] + [urlencode({**params, "page_token": token}) for token in page_tokens]
 
-    assert result == ["1", "2", "3", "4", "5", "6", "7", "8"]
+def test_get_provider_list_paging(mock_veza_con, mock_session_request):
+    # test that the provider list is requested with the default page size and collected across pages
+    pages = _PAGES["values"]
+    _mock_pages(mock_session_request, pages)
 
-    # assert that it made three request calls to get through all the pages
-    assert mock_request.call_count == 3
+    result = mock_veza_con.get_provider_list()
 
-    # check that the page_token params is set correctly on each of the three expected API calls
-    # first call should have no page size
-    call_1 = mock_request.call_args_list[0]
-    assert call_1.kwargs.get("params") is None
+    assert result == _PAGED_VALUES
+    assert mock_session_request.call_count == len(pages)
 
-    call_2 = mock_request.call_args_list[1]
-    assert "page_token=page2" in call_2.kwargs.get("params")
+    params = {"page_size": OAAClient.DEFAULT_PAGE_SIZE}
+    page_tokens = [json.loads(page)["next_page_token"] for page in pages[:-1]]
+    call_params = [c.kwargs.get("params") for c in mock_session_request.call_args_list]
+    assert call_params == [urlencode(params)] + [urlencode({**params, "page_token": token}) for token in page_tokens]
+    # autospec records the session as the first argument, followed by the method and url
+    assert all(c.args[2].endswith("/api/v1/providers/custom") for c in mock_session_request.call_args_list)
 
-    call_3 = mock_request.call_args_list[2]
-    assert "page_token=page3" in call_3.kwargs.get("params")
+@pytest.mark.parametrize("method,kwargs", [("api_get", {}), ("api_post", {"data": {}})])
+def test_api_paging_value(mock_veza_con, mock_session_request, method, kwargs):
+    # test that a singular `value` response is returned without paging
 
-@patch.object(requests.Session, "request")
-def test_api_paging_post_value(mock_request):
+    _mock_pages(mock_session_request, [_VALUE_PAGE])
 
-    test_api_key = "1234"
-    url = "https://noreply.vezacloud.com"
-
-    with patch.object(OAAClient, "_test_connection", return_value=None):
-        veza_con = OAAClient(url=url, token=test_api_key)
-
-    mock_response = Response()
-    mock_response.status_code = 200
-    mock_response._content = b"""{"value": {"id": "thing"}, "has_more": false}"""
-    mock_response.url = url
-
-    mock_request.side_effect = [mock_response]
-
-    thing = veza_con.api_post("/mock/call", data={})
-    assert mock_request.call_count == 1
+    thing = getattr(mock_veza_con, method)("/mock/call", **kwargs)
+    assert mock_session_request.call_count == 1
 
     assert thing == {"id": "thing"}
-    return
-
-@patch.object(requests.Session, "request")
-def test_api_paging_put(mock_request):
-
-    test_api_key = "1234"
-    url = "https://noreply.vezacloud.com"
-
-    with patch.object(OAAClient, "_test_connection", return_value=None):
-        veza_con = OAAClient(url=url, token=test_api_key)
-
-    # build some fake pages
-    page_1 = b"""{"values": ["1", "2", "3"], "has_more": true, "next_page_token": "page2"}"""
-    page_2 = b"""{"values": ["4", "5", "6"], "has_more": true, "next_page_token": "page3"}"""
-    page_3 = b"""{"values": ["7", "8"], "has_more": false}"""
-
-    responses = []
-
-    for page in [page_1, page_2, page_3]:
-        mock_response = Response()
-        mock_response.status_code = 200
-        mock_response._content = page
-        mock_response.url = url
-
-        responses.append(mock_response)
 
-    mock_request.side_effect = responses
 
-    result = veza_con.api_put("/fake/url", data={})
+def test_allowed_characters(mock_veza_con):
 
-    assert result == ["1", "2", "3", "4", "5", "6", "7", "8"]
+    veza_con = mock_veza_con
 
-    # assert that it made three request calls to get through all the pages
-    assert mock_request.call_count == 3
-
-    # check that the page_token params is set correctly on each of the three expected API calls
-    # first call should have no page size
-    call_1 = mock_request.call_args_list[0]
-    assert call_1.kwargs.get("params") is None
-
-    call_2 = mock_request.call_args_list[1]
-    assert "page_token=page2" in call_2.kwargs.get("params")
-
-    call_3 = mock_request.call_args_list[2]
-    assert "page_token=page3" in call_3.kwargs.get("params")
-
-
-def test_allowed_characters():
-
-    test_api_key = "1234"
-    url = "https://noreply.vezacloud.com"
-
-    with patch.object(OAAClient, "_test_connection", return_value=None):
-        veza_con = OAAClient(url=url, token=test_api_key)
-
-    with pytest.raises(ValueError) as e:
+    with pytest.raises(ValueError, match="Provider name contains invalid characters"):
         veza_con.create_provider("invalid/characters", "application")
 
-    assert e.value is not None
-    assert "Provider name contains invalid characters" in str(e.value)
-
-    with pytest.raises(ValueError) as e:
+    with pytest.raises(ValueError, match="Data source name contains invalid characters"):
         veza_con.create_data_source("invalid/characters", provider_id="1234")
 
-    assert e.value is not None
-    assert "Data source name contains invalid characters" in str(e.value)
-
     with patch.object(OAAClient, "api_post", return_value={}):
         provider = veza_con.create_provider("allowed 1234 @#$%&*:()!,_'\" =.-", "application")
 
     assert provider == {}
 
 
-@pytest.mark.skipif(not os.getenv("PYTEST_VEZA_HOST"), reason="Test host is not configured")
-def test_create_query(veza_con):
+@pytest.mark.live
+def test_create_query(veza_con, unique_name):
     """Test the methods for managing queries """
 
     existing_queries = veza_con.get_queries()
@@ -887,28 +582,7 @@ def test_create_query(veza_con):
     assert isinstance(existing_queries, list)
     starting_count = len(existing_queries)
 
-    query_name_uuid = uuid.uuid4()
-    test_query = {
-                    "name": f"Pytest test query {query_name_uuid}",
-                    "description": "Pytest Generated",
-                    "category": "IDP_ANALYSIS",
-                    "level": "BASIC",
-                    "result_type": "NUMBER",
-                    "query_type": "SOURCE_TO_DESTINATION",
-                    "source_node_types": {
-                        "nodes": [
-                            {
-                                "node_type": "OktaUser",
-                                "tags": [],
-                                "conditions": [],
-                                "node_id": "",
-                                "excluded_tags": [],
-                                "count_conditions": []
-                            }
-                        ],
-                        "nodes_operator": "AND"
-                    }
-                }
+    test_query = {**_TEST_QUERY_TEMPLATE, "name": unique_name("Pytest test query")}
 
     create_response = veza_con.create_query(test_query)
     assert isinstance(create_response, dict)
@@ -925,20 +599,19 @@ def test_create_query(veza_con):
     with pytest.raises(OAAResponseError) as e:
         veza_con.get_query_by_id(created_id)
 
-    assert e.value is not None
     assert e.value.status_code == 404
 
-@pytest.mark.skipif(not os.getenv("PYTEST_VEZA_HOST"), reason="Test host is not configured")
-def test_create_report(veza_con):
+@pytest.mark.live
+def test_create_report(veza_con, unique_name):
     """Test the methods for managing reports """
 
     existing_reports = veza_con.get_reports()
     assert isinstance(existing_reports, list)
     starting_count = len(existing_reports)
 
-    report_name_uuid = uuid.uuid4()
+    report_name = unique_name("Pytest Report")
 
-    report_definition = { "name": f"Pytest Report {report_name_uuid}", "description": "Created for Pytest", "category": "OAA", "queries": []}
+    report_definition = { "name": report_name, "description": "Created for Pytest", "category": "OAA", "queries": []}
 
     create_response = veza_con.create_report(report=report_definition)
     assert isinstance(create_response, dict)
@@ -950,28 +623,7 @@ def test_create_report(veza_con):
     assert get_response["id"] == created_id
     assert len(get_response["queries"]) == 0
 
-    query_name_uuid = uuid.uuid4()
-    test_query = {
-                    "name": f"Pytest test query {query_name_uuid}",
-                    "description": "Pytest Generated",
-                    "category": "IDP_ANALYSIS",
-                    "level": "BASIC",
-                    "result_type": "NUMBER",
-                    "query_type": "SOURCE_TO_DESTINATION",
-                    "source_node_types": {
-                        "nodes": [
-                            {
-                                "node_type": "OktaUser",
-                                "tags": [],
-                                "conditions": [],
-                                "node_id": "",
-                                "excluded_tags": [],
-                                "count_conditions": []
-                            }
-                        ],
-                        "nodes_operator": "AND"
-                    }
-                }
+    test_query = {**_TEST_QUERY_TEMPLATE, "name": unique_name("Pytest test query")}
 
     query_create_response = veza_con.create_query(test_query)
     query_id = query_create_response["id"]
@@ -991,10 +643,10 @@ def test_create_report(veza_con):
     log.debug(get_response)
     assert len(get_response["queries"]) == 1
 
-    get_response["name"] = f"Updated Pytest {query_name_uuid}"
+    get_response["name"] = f"Updated {report_name}"
     update_response = veza_con.update_report(report_id=created_id, report=get_response)
     log.debug(update_response)
-    assert update_response["name"] == f"Updated Pytest {query_name_uuid}"
+    assert update_response["name"] == f"Updated {report_name}"
 
     delete_response = veza_con.delete_report(created_id)
     assert isinstance(delete_response, dict)
@@ -1005,43 +657,32 @@ def test_create_report(veza_con):
     veza_con.delete_query(query_id)
 
 
-@patch.object(requests.Session, "request")
-def test_provider_extra_args(mock_session):
-    test_api_key = "1234"
-    # patch _test_connection to instantiate a connection object
-    with patch.object(OAAClient, "_test_connection", return_value=None):
-        veza_con = OAAClient(url="https://noreply.vezacloud.com", token=test_api_key)
+def test_provider_extra_args(mock_veza_con, mock_session_request):
+    veza_con = mock_veza_con
+
+    mock_session_request.return_value = _FakeResponse(_CREATED_PROVIDER)
 
     provider = veza_con.create_provider(name="TestExtra", custom_template="application", options={"extra_bool": True, "extra_string": "test_str"})
 
-    assert provider
+    assert provider == {"id": "123", "name": "TestExtra"}
 
-    print(mock_session)
-    mock_session.assert_called()
-    call0 = mock_session.mock_calls[0]
+    mock_session_request.assert_called_once()
+    call0 = mock_session_request.call_args
     assert call0.kwargs["json"] == {'name': 'TestExtra', 'custom_template': 'application', 'extra_bool': True, 'extra_string': 'test_str'}
 
 
-@patch.object(requests.Session, "request")
 @patch.object(OAAClient, "get_provider", return_value={"id": "123"})
 @patch.object(OAAClient, "get_data_source", return_value={"id": "456"})
-def test_push_extra_options(mock_get_data_source, mock_get_provider, mock_request):
-    test_api_key = "1234"
-    # patch _test_connection to instantiate a connection object
-    with patch.object(OAAClient, "_test_connection", return_value=None):
-        veza_con = OAAClient(url="https://noreply.vezacloud.com", token=test_api_key)
+def test_push_extra_options(mock_get_data_source, mock_get_provider, mock_veza_con, mock_session_request, sample_app):
+    veza_con = mock_veza_con
 
-    mock_response = Response()
-    mock_response.status_code = 200
-    mock_response._content = b"""{"id": "987"}"""
-    mock_response.url = "https://pytest.veza.com"
+    mock_session_request.return_value = _FakeResponse(_PUSH_RESULT, url="https://pytest.veza.com")
 
-    app = generate_app()
-    response = veza_con.push_application(provider_name="provider", data_source_name="data source", application_object=app, options={"extra": "pytest", "something": "value"})
+    response = veza_con.push_application(provider_name="provider", data_source_name="data source", application_object=sample_app, options={"extra": "pytest", "something": "value"})
 
-    assert mock_request.called
+    assert mock_session_request.called
 
-    call = mock_request.call_args
+    call = mock_session_request.call_args
     call_json = call.kwargs.get("json")
     assert call_json
 
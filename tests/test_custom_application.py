@@ -244,9 +244,8 @@ def test_exceptions():
     assert e.value.message == "Cannot add group to self"
 
 
-def test_generate_app():
-    app = generate_app()
-    payload = app.get_payload()
+def test_generate_app(sample_app):
+    payload = sample_app.get_payload()
 
     # ensure the app is as we expect
     assert payload == json.loads(GENERATED_APP_PAYLOAD)
@@ -340,7 +339,6 @@ def test_custom_properties():
             break
     assert operators_payload["custom_properties"]["built_in"] is True
 
-    print(json.dumps(payload, indent=2))
     assert payload == json.loads(CUSTOM_PROPERTIES_PAYLOAD)
 
 
@@ -10,7 +10,23 @@ import pytest
 import json
 
 from oaaclient.templates import CustomIdPProvider, OAATemplateException
-from generate_idp import generate_idp, GENERATED_IDP_PAYLOAD
+from generate_idp import GENERATED_IDP_PAYLOAD
+
+
+# users as (name, identity, properties), groups as (name, identity) and memberships as (user identity, group identities)
+_USERS = [("user001", None, {"department": "Quality Assurance", "manager_id": "user003_identity"}),
+          ("user002", None, {}),
+          ("user003", "user003_identity", {"is_guest": False}),
+          ("user004", None, {"is_guest": True}),
+          ]
+_GROUPS = [("group001", None),
+           ("group002", None),
+           ("group003", "group003_identity"),
+           ]
+_GROUP_MEMBERSHIPS = [("user001", ["group001"]),
+                      ("user002", ["group002"]),
+                      ("user003_identity", ["group001", "group002"]),
+                      ]
 
 
 def test_custom_idp():
@@ -19,26 +35,21 @@ def test_custom_idp():
     idp = CustomIdPProvider(idp_name, idp_type, "pytest test IdP")
 
     # create some users
-    user001 = idp.add_user("user001")
-    user001.department = "Quality Assurance"
-    user001.department = "Quality Assurance"
-    user001.manager_id = "user003_identity"
-    user002 = idp.add_user("user002")
-    user003 = idp.add_user("user003", identity="user003_identity")
-    user004 = idp.add_user("user004")
-
-    user003.is_guest = False
-    user004.is_guest = True
+    for name, identity, properties in _USERS:
+        user = idp.add_user(name, identity=identity)
+        for key, value in properties.items():
+            setattr(user, key, value)
 
     # create groups
-    idp.add_group("group001")
-    idp.add_group("group002")
-    idp.add_group("group003", identity="group003_identity")
+    for name, identity in _GROUPS:
+        idp.add_group(name, identity=identity)
 
     # add users to groups
-    user001.add_groups(["group001"])
-    user002.add_groups(["group002"])
-    idp.users["user003_identity"].add_groups(["group001", "group002"])
+    for user_identity, group_identities in _GROUP_MEMBERSHIPS:
+        idp.users[user_identity].add_groups(group_identities)
+
+    user001 = idp.users["user001"]
+    user002 = idp.users["user002"]
 
     user001.add_assumed_role_arns(["arn:aws:iam::123456789012:role/role001", "arn:aws:iam::123456789012:role/role002"])
     # test adding a role multiple times is deduplicated property
@@ -47,64 +58,44 @@ def test_custom_idp():
 
     payload = idp.get_payload()
 
-    print(json.dumps(payload, indent=2))
-    expected_result = json.loads(TEST_CUSTOM_IDP_RESULT)
-
-    assert payload == expected_result
-
-
-def test_generate_idp():
-    idp = generate_idp()
-    payload = idp.get_payload()
-    print(json.dumps(payload, indent=2))
-
-    assert payload == json.loads(GENERATED_IDP_PAYLOAD)
-
-
-def test_custom_idp_exceptions():
-    idp_name = "test"
-    idp_type = "test_idp"
-    idp = CustomIdPProvider(idp_name, idp_type, "pytest test IdP")
+    assert payload == _EXPECTED_CUSTOM_IDP
 
-    # assert duplicate user raises exception
-    user_name = "duplicate001"
-    idp.add_user(user_name)
-    with pytest.raises(OAATemplateException) as e:
-        idp.add_user(user_name)
-    assert user_name in e.value.message
 
-    # asert duplicate group raises exception
-    group_name = "dupgroup"
-    idp.add_group(group_name)
-    with pytest.raises(OAATemplateException) as e:
-        idp.add_group(group_name)
-    assert group_name in e.value.message
+def test_generate_idp(sample_idp):
+    payload = sample_idp.get_payload()
+    assert payload == _EXPECTED_GENERATED
 
-    # assert add_assumed_role_arns enforces list
-    test_user = idp.add_user("test001")
-    with pytest.raises(OAATemplateException) as e:
-        test_user.add_assumed_role_arns("arn:aws:iam::123456789012:role/role001")
-    assert e.value.message == "arns must be of type list"
 
-    with pytest.raises(OAATemplateException) as e:
-        test_user.add_groups("group01")
-    assert e.value.message == "group_identities must be list"
+@pytest.fixture
+def idp():
+    """CustomIdPProvider with the users and groups that the exception cases conflict with"""
+    idp = CustomIdPProvider("test", "test_idp", "pytest test IdP")
+    idp.add_user("duplicate001")
+    idp.add_user("test001")
+    idp.add_group("dupgroup")
+    idp.add_group(name="test")
+    idp.add_group(name="test", identity="test2")
 
-    with pytest.raises(OAATemplateException) as e:
-        test_user.set_source_identity("bob", "somestring")
-    assert e.value.message == "provider_type must be IdPProviderType enum"
+    return idp
 
-    test_group = idp.add_group(name="test")
-    with pytest.raises(OAATemplateException) as e:
-      test_group.add_groups(["test"])
 
-    assert e.value.message == "Cannot add a group to itself 'test'"
-
-    test_group2 = idp.add_group(name="test", identity="test2")
+@pytest.mark.parametrize("action,message",
+                         [
+                             (lambda idp: idp.add_user("duplicate001"), "IdP user identified by duplicate001 already defined"),
+                             (lambda idp: idp.add_group("dupgroup"), "IdP group dupgroup already defined"),
+                             (lambda idp: idp.users["test001"].add_assumed_role_arns("arn:aws:iam::123456789012:role/role001"), "arns must be of type list"),
+                             (lambda idp: idp.users["test001"].add_groups("group01"), "group_identities must be list"),
+                             (lambda idp: idp.users["test001"].set_source_identity("bob", "somestring"), "provider_type must be IdPProviderType enum"),
+                             (lambda idp: idp.groups["test"].add_groups(["test"]), "Cannot add a group to itself 'test'"),
+                             (lambda idp: idp.groups["test2"].add_groups(["test2"]), "Cannot add a group to itself 'test2'"),
+                         ],
+                         ids=["duplicate_user", "duplicate_group", "role_arns_not_list", "groups_not_list", "source_identity_type", "group_in_itself", "group_in_itself_identity"]
+                        )
+def test_custom_idp_exceptions(idp, action, message):
     with pytest.raises(OAATemplateException) as e:
-      test_group2.add_groups(["test2"])
+        action(idp)
 
-    assert e.value.message == "Cannot add a group to itself 'test2'"
+    assert e.value.message == message
 
 # expected paylods
 TEST_CUSTOM_IDP_RESULT = """
@@ -195,3 +186,7 @@ TEST_CUSTOM_IDP_RESULT = """
   "apps": []
 }
 """
+
+# expected payloads parsed once at import
+_EXPECTED_CUSTOM_IDP = json.loads(TEST_CUSTOM_IDP_RESULT)
+_EXPECTED_GENERATED = json.loads(GENERATED_IDP_PAYLOAD)
@@ -9,63 +9,58 @@ https://opensource.org/licenses/MIT.
 import json
 import pytest
 
-from generate_hris import GENERATED_HRIS_PAYLOAD, generate_hris
+from generate_hris import GENERATED_HRIS_PAYLOAD
 
 from oaaclient.templates import HRISEmployee, HRISGroup, HRISProvider, OAAPropertyType, OAATemplateException
 
-def test_generate_hris():
-    hris = generate_hris()
-    payload = hris.get_payload()
-    print(json.dumps(payload, indent=2))
+# expected payload parsed once at import
+_EXPECTED_GENERATED = json.loads(GENERATED_HRIS_PAYLOAD)
 
-    assert payload == json.loads(GENERATED_HRIS_PAYLOAD)
 
-def test_hris_exceptions():
+def test_generate_hris(sample_hris):
+    payload = sample_hris.get_payload()
+    assert payload == _EXPECTED_GENERATED
 
-    hris = generate_hris()
 
-    # test duplicate user
-    user_details = {"unique_id": "12345",
-                    "name": "Test User",
-                    "employee_number": "12345",
-                    "first_name": "first",
-                    "last_name": "last",
-                    "is_active": True,
-                    "employment_status": "hired"
-                }
+_EMPLOYEE_DETAILS = {"unique_id": "12345",
+                     "name": "Test User",
+                     "employee_number": "12345",
+                     "first_name": "first",
+                     "last_name": "last",
+                     "is_active": True,
+                     "employment_status": "hired"
+                     }
+_GROUP_DETAILS = {"unique_id": "g12345",
+                  "name": "test group",
+                  "group_type": "Team"
+                  }
 
-    hris.add_employee(**user_details)
 
-    with pytest.raises(OAATemplateException) as e:
-        hris.add_employee(**user_details)
-
-    assert e.value.message == "Employee with unique ID already exists, 12345"
-
-    # test duplicate group
-    group_details = {"unique_id": "g12345",
-                     "name": "test group",
-                     "group_type": "Team"
-                    }
-
-    hris.add_group(**group_details)
-
-    with pytest.raises(OAATemplateException) as e:
-        hris.add_group(**group_details)
+@pytest.fixture
+def hris(fresh_hris):
+    """HRISProvider with the employee and group that the exception cases conflict with"""
+    hris = fresh_hris
+    hris.add_employee(**_EMPLOYEE_DETAILS)
+    hris.add_group(**_GROUP_DETAILS)
 
-    assert e.value.message == "Group with unique ID already exists, g12345"
+    return hris
 
-    with pytest.raises(OAATemplateException) as e:
-        hris.property_definitions.define_employee_property(1, OAAPropertyType.BOOLEAN)
-
-    assert e.value.message == "Property name must be a string, received <class 'int'>"
-
-    with pytest.raises(OAATemplateException) as e:
-        hris.property_definitions.define_employee_property("@property", OAAPropertyType.BOOLEAN)
 
-    assert e.value.message == "Lower-cased property name must match the pattern: '^[a-z][a-z_]*$'. Invalid name: @property"
+@pytest.mark.parametrize("action,exception,message",
+                         [
+                             (lambda hris: hris.add_employee(**_EMPLOYEE_DETAILS), OAATemplateException, "Employee with unique ID already exists, 12345"),
+                             (lambda hris: hris.add_group(**_GROUP_DETAILS), OAATemplateException, "Group with unique ID already exists, g12345"),
+                             (lambda hris: hris.property_definitions.define_employee_property(1, OAAPropertyType.BOOLEAN), OAATemplateException, "Property name must be a string, received <class 'int'>"),
+                             (lambda hris: hris.property_definitions.define_employee_property("@property", OAAPropertyType.BOOLEAN), OAATemplateException, "Lower-cased property name must match the pattern: '^[a-z][a-z_]*$'. Invalid name: @property"),
+                             (lambda hris: hris.system.add_idp_type("okta"), ValueError, "provider_type must be of type IdPProviderType enum, received <class 'str'>"),
+                         ],
+                         ids=["duplicate_employee", "duplicate_group", "property_name_type", "property_name_pattern", "idp_type"]
+                        )
+def test_hris_exceptions(hris, action, exception, message):
+    with pytest.raises(exception) as e:
+        action(hris)
 
-    with pytest.raises(ValueError, match=r"provider_type must be of type IdPProviderType enum, received <class 'str'>") as e:
-        hris.system.add_idp_type("okta")
+    assert str(e.value) == message
 
 
 # Test for empty input validation on user creation
@@ -81,10 +76,15 @@ def test_hris_exceptions():
                         ])
 def test_employee_init(details):
 
-    with pytest.raises(ValueError) as e:
-        employee = HRISEmployee(**details)
+    with pytest.raises(ValueError):
+        HRISEmployee(**details)
+
 
-    assert e.value.args is not None
+def _assert_in(e: pytest.ExceptionInfo, *fragments: str) -> None:
+    """Assert that the raised exception message contains all the fragments"""
+    message = e.value.message
+    for fragment in fragments:
+        assert fragment in message, (fragment, message)
 
 
 def test_hris_custom_properties():
@@ -96,16 +96,14 @@ def test_hris_custom_properties():
     with pytest.raises(OAATemplateException) as e:
         employee1.set_property("unset", "something")
 
-    assert "employee" in e.value.message
-    assert "unset" in e.value.message
+    _assert_in(e, "employee", "unset")
 
     group1 = hris.add_group("g01", "group01", "testGroup")
 
     with pytest.raises(OAATemplateException) as e:
         group1.set_property("unset", "hello")
 
-    assert "group" in e.value.message
-    assert "unset" in e.value.message
+    _assert_in(e, "group", "unset")
 
 
     hris.property_definitions.define_employee_property("testProp", OAAPropertyType.STRING)
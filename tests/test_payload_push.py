@@ -6,18 +6,14 @@ license that can be found in the LICENSE file or at
 https://opensource.org/licenses/MIT.
 """
 
+import copy
 import os
 import re
 import time
-import uuid
 
 import pytest
-from generate_app import generate_app
 from generate_app_id_mapping import generate_app_id_mapping
-from generate_hris import generate_hris
-from generate_idp import generate_idp
 
-import oaaclient.utils as utils
 from oaaclient.client import OAAClient, OAAClientError
 
 # set the timeout for the push tests, if the the datasource does not parse
@@ -26,104 +22,103 @@ TEST_TIMEOUT = os.getenv("OAA_PUSH_TIMEOUT", 300)
 # REGEX for matching failure data source parsing messages for fast failing tests
 FAILURE_REGEX = re.compile(r"fail|error", re.IGNORECASE)
 
-@pytest.mark.skipif(not os.getenv("PYTEST_VEZA_HOST"), reason="Test host is not configured")
-@pytest.mark.timeout(TEST_TIMEOUT)
-def test_payload_push(veza_con, app_provider):
-    # make sure compression is disabled
-    veza_con.enable_compression = False
-    app = generate_app()
+# polling interval bounds in seconds while waiting for a data source to parse
+POLL_INITIAL_DELAY = 0.25
+POLL_MAX_DELAY = 4.0
 
-    data_source_name = os.environ.get('PYTEST_CURRENT_TEST').replace("/", "-")
+# seconds reserved from TEST_TIMEOUT so a stuck data source fails the wait before pytest-timeout kills the test, covers
+# fixture setup and the final status request
+WAIT_TIMEOUT_MARGIN = 10
 
-    b64_icon = utils.encode_icon_file("tests/oaa_icon.png")
-    veza_con.update_provider_icon(provider_id=app_provider['id'], base64_icon=b64_icon)
+# seconds to wait for a data source to parse, counted from the push, the margin is capped at half of TEST_TIMEOUT so
+# short timeouts still leave time to poll
+WAIT_TIMEOUT = float(TEST_TIMEOUT) - min(WAIT_TIMEOUT_MARGIN, float(TEST_TIMEOUT) / 2)
 
-    response = veza_con.push_application(app_provider['name'],
-                                           data_source_name=data_source_name,
-                                           application_object=app
-                                           )
-    if not response:
-        assert False
+# warnings expected from pushing the sample app, the payload references roles and identities that do not exist
+EXPECTED_WARNING_MESSAGES = ("Role is missing permission", "Cannot find identity by names")
 
-    # Veza API always returns the warnings key, the list may be empty, in this case we expect it not to be
-    assert "warnings" in response
-    # since our payload includes fake identities expect warnings about not matching identities
-    assert response["warnings"] is not None
-    assert len(response["warnings"]) == 6
-    for warning in response["warnings"]:
-        if "Role is missing permission" in warning.get("message", ""):
-            pass
-        elif "Cannot find identity by names" in warning.get("message", ""):
-            pass
-        else:
-            assert False, "Got unexpected warning from response"
-
-    data_source = veza_con.get_data_source(data_source_name, provider_id=app_provider["id"])
+
+def _wait_for_datasource(veza_con: OAAClient, data_source_name: str, provider_id: str, deadline: float) -> None:
+    """Wait for a pushed data source to finish parsing
+
+    Polls the data source status with an exponential back off until it succeeds, fails, or the `time.monotonic()`
+    deadline passes. Fails the test on a parsing failure or timeout. The Veza API does not offer a long-poll or
+    notification for data source status, each poll is a single call filtered to the data source name.
+    """
+    delay = POLL_INITIAL_DELAY
     while True:
-        data_source = veza_con.get_data_source(data_source_name, provider_id=app_provider["id"])
-        if data_source["status"] == "SUCCESS":
-            break
-        elif FAILURE_REGEX.match(data_source["status"]):
+        data_source = veza_con.get_data_source(data_source_name, provider_id=provider_id)
+        status = data_source["status"]
+        if status == "SUCCESS":
+            return
+        elif FAILURE_REGEX.match(status):
             print(data_source)
             assert False, "Datasource parsing failure"
-        else:
-            time.sleep(4)
 
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            print(data_source)
+            assert False, f"Datasource did not finish parsing within {WAIT_TIMEOUT:g} seconds of the push"
 
-@pytest.mark.skipif(not os.getenv("PYTEST_VEZA_HOST"), reason="Test host is not configured")
-@pytest.mark.timeout(TEST_TIMEOUT)
-def test_payload_push_compressed(veza_con, app_provider):
-    # enable compression
-    veza_con.enable_compression = True
-    app = generate_app()
-    data_source_name = os.environ.get('PYTEST_CURRENT_TEST').replace("/", "-")
+        # never sleep past the deadline, the final poll happens as the deadline lapses rather than up to one back off
+        # interval after it
+        time.sleep(min(delay, remaining))
+        delay = min(delay * 2, POLL_MAX_DELAY)
 
-    b64_icon = utils.encode_icon_file("tests/oaa_icon.png")
-    veza_con.update_provider_icon(provider_id=app_provider['id'], base64_icon=b64_icon)
 
-    response = veza_con.push_application(app_provider['name'],
-                                           data_source_name=data_source_name,
-                                           application_object=app
-                                           )
-    if not response:
-        assert False
+def _push_and_wait(veza_con: OAAClient, provider: dict, data_source_name: str, application_object) -> dict:
+    """Push an OAA object and wait for the data source to finish parsing
+
+    Returns:
+        dict: API response to the push, Veza API always returns the warnings key but the list may be empty
+    """
+    # the wait deadline counts from before the push so it expires ahead of the test's pytest-timeout
+    deadline = time.monotonic() + WAIT_TIMEOUT
+    try:
+        response = veza_con.push_application(provider["name"],
+                                             data_source_name=data_source_name,
+                                             application_object=application_object
+                                             )
+    except OAAClientError as e:
+        pytest.fail(f"Push failed: {e}, details: {e.details}")
 
-    # Veza API always returns the warnings key, the list may be empty, in this case we expect it not to be
+    assert response
     assert "warnings" in response
+
+    # print out any warnings from the push for debugging purposes, warnings will include being unable to find fake
+    # identities
+    if response["warnings"]:
+        print("Push warnings:")
+        for warning in response["warnings"]:
+            print(f"  - {warning}")
+
+    _wait_for_datasource(veza_con, data_source_name, provider_id=provider["id"], deadline=deadline)
+
+    return response
+
+
+@pytest.mark.live
+@pytest.mark.timeout(TEST_TIMEOUT)
+@pytest.mark.parametrize("compressed", [False, True], ids=["uncompressed", "compressed"])
+def test_payload_push(veza_con, app_provider, data_source_name, monkeypatch, compressed, sample_app):
+    monkeypatch.setattr(veza_con, "enable_compression", compressed)
+
+    response = _push_and_wait(veza_con, app_provider, data_source_name, sample_app)
+
     # since our payload includes fake identities expect warnings about not matching identities
     assert response["warnings"] is not None
     assert len(response["warnings"]) == 6
-    for warning in response["warnings"]:
-        if "Role is missing permission" in warning.get("message", ""):
-            pass
-        elif "Cannot find identity by names" in warning.get("message", ""):
-            pass
-        else:
-            assert False, "Got unexpected warning from response"
-
-    data_source = veza_con.get_data_source(data_source_name, provider_id=app_provider["id"])
-    while True:
-        data_source = veza_con.get_data_source(data_source_name, provider_id=app_provider["id"])
-        if data_source["status"] == "SUCCESS":
-            break
-        elif FAILURE_REGEX.match(data_source["status"]):
-            print(data_source)
-            assert False, "Datasource parsing failure"
-        else:
-            time.sleep(4)
+    unexpected = [w for w in response["warnings"] if not any(m in w.get("message", "") for m in EXPECTED_WARNING_MESSAGES)]
+    assert not unexpected, "Got unexpected warning from response"
 
 
-@pytest.mark.skipif(not os.getenv("PYTEST_VEZA_HOST"), reason="Test host is not configured")
+@pytest.mark.live
 @pytest.mark.timeout(TEST_TIMEOUT)
-def test_push_provider_create(veza_con: OAAClient):
-    # make sure compression is disabled
-    app = generate_app()
-
-    data_source_name = os.environ.get('PYTEST_CURRENT_TEST').replace("/", "-")
-    provider_name = f"Pytest Provider {uuid.uuid4()}"
+def test_push_provider_create(veza_con: OAAClient, data_source_name, sample_app, unique_name):
+    provider_name = unique_name("Pytest Provider")
     response = veza_con.push_application(provider_name=provider_name,
                                            data_source_name=data_source_name,
-                                           application_object=app,
+                                           application_object=sample_app,
                                            create_provider=True
                                         )
     if not response:
@@ -135,60 +130,26 @@ def test_push_provider_create(veza_con: OAAClient):
 
     veza_con.delete_provider(got_provider["id"])
 
-@pytest.mark.skipif(not os.getenv("PYTEST_VEZA_HOST"), reason="Test host is not configured")
+@pytest.mark.live
 @pytest.mark.timeout(TEST_TIMEOUT)
-def test_payload_push_id_mapping(veza_con, app_provider):
+def test_payload_push_id_mapping(veza_con, app_provider, data_source_name):
     """ test for app payload where identities are mapped by id instead of name """
 
-    app = generate_app_id_mapping()
-    data_source_name = os.environ.get('PYTEST_CURRENT_TEST').replace("/", "-")
-
-    b64_icon = utils.encode_icon_file("tests/oaa_icon.png")
-    veza_con.update_provider_icon(provider_id=app_provider['id'], base64_icon=b64_icon)
+    response = _push_and_wait(veza_con, app_provider, data_source_name, generate_app_id_mapping())
 
-    response = None
-    try:
-        response = veza_con.push_application(app_provider['name'],
-                                            data_source_name=data_source_name,
-                                            application_object=app
-                                            )
-    except OAAClientError as e:
-        print(e)
-        print(e.details)
-        assert False
-
-    if not response:
-        assert False
-
-    # Veza API always returns the warnings key, the list may be empty, in this case we expect it not to be
-    assert "warnings" in response
     # since our payload includes fake identities expect warnings about not matching identities
     assert response["warnings"] is not None
     for warning in response["warnings"]:
         assert warning['message'].startswith("Cannot find identity by names")
 
-    data_source = veza_con.get_data_source(data_source_name, provider_id=app_provider["id"])
-    while True:
-        data_source = veza_con.get_data_source(data_source_name, provider_id=app_provider["id"])
-        if data_source["status"] == "SUCCESS":
-            break
-        elif FAILURE_REGEX.match(data_source["status"]):
-            print(data_source)
-            assert False, "Datasource parsing failure"
-        else:
-            time.sleep(4)
 
+@pytest.mark.live
+def test_bad_payload(veza_con, app_provider, data_source_name, app_payload):
 
-@pytest.mark.skipif(not os.getenv("PYTEST_VEZA_HOST"), reason="Test host is not configured")
-def test_bad_payload(veza_con, app_provider):
-
-    app = generate_app()
-    payload = app.get_payload()
+    payload = copy.deepcopy(app_payload)
     # break the payload so it will throw an error
     payload['applications'][0]["bad_property"] = "This will break things"
 
-    data_source_name = os.environ.get('PYTEST_CURRENT_TEST').replace("/", "-")
-
     with pytest.raises(OAAClientError) as e:
         response = veza_con.push_metadata(provider_name=app_provider['name'], data_source_name=data_source_name, metadata=payload)
 
@@ -199,68 +160,18 @@ def test_bad_payload(veza_con, app_provider):
     return
 
 
-@pytest.mark.skipif(not os.getenv("PYTEST_VEZA_HOST"), reason="Test host is not configured")
+@pytest.mark.live
 @pytest.mark.timeout(TEST_TIMEOUT)
-def test_idp_payload_push(veza_con, idp_provider):
+def test_idp_payload_push(veza_con, idp_provider, data_source_name, sample_idp):
 
-    idp = generate_idp()
-
-    data_source_name = os.environ.get('PYTEST_CURRENT_TEST').replace("/", "-")
-    response = veza_con.push_application(idp_provider['name'],
-                                           data_source_name=data_source_name,
-                                           application_object=idp
-                                           )
-    if not response:
-        assert False
-
-    # print out any warnigns from the push for debugging puproses, warnings are not a failure, warnings will include
-    # being unable to find fake identities
-    if response.get("warnings", None):
-        print("Push warnings:")
-        for e in response["warnings"]:
-            print(f"  - {e}")
-
-    while True:
-        data_source = veza_con.get_data_source(data_source_name, provider_id=idp_provider["id"])
-        if data_source["status"] == "SUCCESS":
-            break
-        elif FAILURE_REGEX.match(data_source["status"]):
-            print(data_source)
-            assert False, "Datasource parsing failure"
-        else:
-            time.sleep(4)
+    _push_and_wait(veza_con, idp_provider, data_source_name, sample_idp)
 
     return
 
-@pytest.mark.skipif(not os.getenv("PYTEST_VEZA_HOST"), reason="Test host is not configured")
+@pytest.mark.live
 @pytest.mark.timeout(TEST_TIMEOUT)
-def test_hris_payload_push(veza_con, hris_provider):
-
-    hris = generate_hris()
-
-    data_source_name = os.environ.get('PYTEST_CURRENT_TEST').replace("/", "-")
-    response = veza_con.push_application(hris_provider['name'],
-                                           data_source_name=data_source_name,
-                                           application_object=hris
-                                           )
-    if not response:
-        assert False
-
-    # print out any warnigns from the push for debugging puproses, warnings are not a failure, warnings will include
-    # being unable to find fake identities
-    if response.get("warnings", None):
-        print("Push warnings:")
-        for e in response["warnings"]:
-            print(f"  - {e}")
+def test_hris_payload_push(veza_con, hris_provider, data_source_name, sample_hris):
 
-    while True:
-        data_source = veza_con.get_data_source(data_source_name, provider_id=hris_provider["id"])
-        if data_source["status"] == "SUCCESS":
-            break
-        elif FAILURE_REGEX.match(data_source["status"]):
-            print(data_source)
-            assert False, "Datasource parsing failure"
-        else:
-            time.sleep(4)
+    _push_and_wait(veza_con, hris_provider, data_source_name, sample_hris)
 
     return
@@ -80,17 +80,34 @@ def test_caseinsensitivedict():
     mixed["string"] = "I am a string"
     mixed[1] = "I am an int"
     mixed[2.0] = "I am a float"
+    mixed[b"Bytes"] = "I am bytes"
 
     assert mixed.get("STRING") == "I am a string"
     assert mixed.get(1) == "I am an int"
     assert mixed.get(2.0) == "I am a float"
+    assert mixed.get(b"BYTES") == "I am bytes"
 
     assert mixed.pop("STRING") == "I am a string"
     assert mixed.pop(2.0) == "I am a float"
+    assert mixed.pop(b"bytes") == "I am bytes"
 
     assert len(mixed) == 1
 
     assert not mixed == x
     assert mixed == mixed
 
-    return
\ No newline at end of file
+    return
+
+def test_caseinsensitivedict_non_ascii():
+    """ non-ASCII keys use `str.lower()`, not case folding """
+
+    x = CaseInsensitiveDict()
+    x["ÉCOLE"] = "value"
+    x["Straße"] = "street"
+
+    assert x["école"] == "value"
+    assert "STRASSE" not in x
+    assert list(x.keys()) == ["école", "straße"]
+
+    del x["École"]
+    assert "école" not in x
@@ -26,13 +26,11 @@ def test_tag_characters():
     with pytest.raises(OAATemplateException) as e:
         Tag("illegal:value!")
 
-    assert e is not None
     assert "Invalid characters in tag key" in e.value.message
 
     with pytest.raises(OAATemplateException) as e:
         Tag("goodkey", "bad!value*")
 
-    assert e is not None
     assert "Invalid characters in tag value" in e.value.message
 
 
@@ -8,7 +8,6 @@ https://opensource.org/licenses/MIT.
 
 import oaaclient.utils as utils
 import json
-import logging
 import os
 import uuid
 import pytest
@@ -16,11 +15,6 @@ import pytest
 from generate_app import generate_app
 from oaaclient.client import OAAClient
 
-# enable debug logging
-logging.basicConfig(level=logging.DEBUG)
-log = logging.getLogger()
-log.setLevel(logging.DEBUG)
-
 OAA_ICON_B64="""
 iVBORw0KGgoAAAANSUhEUgAAAEAAAABACAYAAACqaXHeAAAACXBIWXMAAASKAAAEigFnZN0UAAAAGXRFWHRTb2Z0d2FyZQB3d3cuaW5rc2NhcGUub3Jnm+48
 GgAADK9JREFUeJztm3twVPUVxz/nZhMSIYAPwEctvqjVFqsVC6LVtEWyG0Do1CCKUoHS7AakLTJardLFqZ22jqXyyGYtSo20UMTBQWV3o7QZqbXUUhX7cFpt
@@ -61,6 +55,7 @@ G4CDJOVMNwuSozzFoNH/NnAOIgslGMvySK2v1cofAhaC7CUYO8PNrVYv7utdwBZgBmayWiP+Z1FtIpTY
 TwTjF7j9NSy3V9N3eToRfoLKRgzfJszkZqwDThomsA3hCaRzYyFfhzihOB9OLg8Mo4wZqM4AhmPKfJkfa3bNx/Ii7wDzAGbnpsyrs7pq4ngMowk4jOpTlKTW
 St0Lu0/A7v8oBP8C5c/bv/qD2C0AAAAASUVORK5CYII=
 """
+_OAA_ICON_B64 = OAA_ICON_B64.replace("\n", "")
 
 def test_encode_icon_file():
 
@@ -69,14 +64,16 @@ def test_encode_icon_file():
     assert b64_icon is not None
     assert isinstance(b64_icon, str)
 
-    assert b64_icon == OAA_ICON_B64.replace("\n", "")
+    assert b64_icon == _OAA_ICON_B64
 
 
-@pytest.mark.skipif(not os.getenv("PYTEST_VEZA_HOST"), reason="Test host is not configured")
+@pytest.mark.live
 def test_create_report(veza_con: OAAClient):
 
     app = generate_app()
-    provider_name = f"Pytest Report test {uuid.uuid4()}"
+    # single UUID for the provider, report and query names to avoid concurrent test issues
+    test_uuid = uuid.uuid4()
+    provider_name = f"Pytest Report test {test_uuid}"
 
     provider = veza_con.create_provider(provider_name, custom_template="application")
     veza_con.push_application(provider_name=provider_name,
@@ -88,13 +85,11 @@ def test_create_report(veza_con: OAAClient):
     with open("tests/report_test.json") as f:
         report_definition_orign = json.load(f)
 
-    # need to set all names to UUID to avoid concurrent test issues
-    report_uuid = uuid.uuid4()
     report_definition = {}
-    report_definition["name"] = f"Pytest {report_uuid}"
+    report_definition["name"] = f"Pytest {test_uuid}"
     report_definition["queries"] = []
     for q in report_definition_orign["queries"]:
-        q["name"] = f"{q['name']} - {report_uuid}"
+        q["name"] = f"{q['name']} - {test_uuid}"
         report_definition["queries"].append(q)
 
     # test creating the report
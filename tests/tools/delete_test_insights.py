@@ -5,15 +5,23 @@ Deletes all the "Pytest *" Reports and Queries that might left over from failed
 import argparse
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
 
 from oaaclient.client import OAAClient, OAAClientError
 
+# name prefix for all the Reports and Queries created by the tests
+TEST_NAME_PREFIX = "Pytest"
+
 def main():
     parser = argparse.ArgumentParser()
     parser.add_argument("--host", default=os.getenv("VEZA_URL"), help="URL endpoint for Veza Deployment")
     parser.add_argument("--dry-run", action="store_true", help="Only print, do not delete")
+    parser.add_argument("--workers", type=int, default=8, help="Number of concurrent delete requests")
     args = parser.parse_args()
 
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+
     veza_api_key = os.getenv("VEZA_API_KEY")
     if not veza_api_key:
         print("Could not load VEZA_API_KEY from environment", file=sys.stderr)
@@ -28,23 +36,28 @@ def main():
             print(e.details, file=sys.stderr)
         sys.exit(1)
 
+    def delete_report(report: dict) -> None:
+        print(f"Deleting Report {report['name']} ({report['id']})")
+        if not args.dry_run:
+            veza_con.delete_report(report["id"])
+
+    def delete_query(query: dict) -> None:
+        print(f"Deleting Query {query['name']} ({query['id']})")
+        if not args.dry_run:
+            veza_con.delete_query(query["id"])
+
     print("Cleaning up reports")
     report_list = veza_con.get_reports()
-    for report in report_list:
-        if report["name"].startswith("Pytest"):
-            print(f"Deleting Report {report['name']} ({report['id']})")
-            if args.dry_run:
-                continue
-            veza_con.delete_report(report["id"])
+    reports = [report for report in report_list if report["name"].startswith(TEST_NAME_PREFIX)]
+    # reports must be deleted before the queries they contain
+    with ThreadPoolExecutor(max_workers=args.workers) as executor:
+        list(executor.map(delete_report, reports))
 
     print("Cleaning up Queries")
     query_list = veza_con.get_queries()
-    for query in query_list:
-        if query["name"].startswith("Pytest"):
-            print(f"Deleting Query {query['name']} ({query['id']})")
-            if args.dry_run:
-                continue
-            veza_con.delete_query(query["id"])
+    queries = [query for query in query_list if query["name"].startswith(TEST_NAME_PREFIX)]
+    with ThreadPoolExecutor(max_workers=args.workers) as executor:
+        list(executor.map(delete_query, queries))
 
     print("Finished")
 